@@ -1,204 +1,238 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
 import streamlit as st
-import pandas as pd
-import altair as alt
+
+from bridge_financing import BridgeResult, calculate_bridge_financing_vec, financing_cost_grid
+from bridge_financing import calculate_bridge_financing as _calculate_bridge_financing
 
 # ---------------------------
 #  Global Settings
 # ---------------------------
 
 CURRENCY_SYMBOL = "PKR"
+SENSITIVITY_MAX_DAYS = 180
+# Axes of the rate x days financing-cost heatmap
+HEATMAP_RATES_PCT = np.arange(6.0, 36.1, 3.0)
+HEATMAP_DAYS = np.arange(15, SENSITIVITY_MAX_DAYS + 1, 15)
 
+# Called on every run: page config is per-run script state, so a session-state guard
+# would drop the wide layout and title from every rerun after the first.
 st.set_page_config(
     page_title="Bridge Financing Calculator",
     layout="wide",
     initial_sidebar_state="collapsed",
 )
 
-# Minimal, safe CSS
-st.markdown(
-    """
-    <style>
-    html, body, [class*="css"], .stApp {
-        font-family: -apple-system, BlinkMacSystemFont, "Helvetica Neue", Helvetica, Arial, sans-serif !important;
-        color: #111111 !important;
-    }
 
-    .stApp {
-        background-color: #f5f5f5 !important;
-    }
+@st.cache_resource
+def _page_css() -> str:
+    """styles.css wrapped in a <style> block; read from disk once per process."""
 
-    .block-container {
-        max-width: 1100px;
-        padding-top: 1.5rem;
-        padding-bottom: 3rem;
-        margin: 0 auto;
-    }
+    return f"<style>{(Path(__file__).parent / 'styles.css').read_text()}</style>"
 
-    h1 {
-        font-weight: 700;
-        letter-spacing: -0.02em;
-        color: #111111 !important;
-        margin-bottom: 0.3rem;
-    }
 
-    .subtitle {
-        font-size: 0.98rem;
-        color: #4b5563;
-        margin-bottom: 1.8rem;
-    }
-
-    label, div[data-testid="stWidgetLabel"] p {
-        color: #111111 !important;
-        font-size: 0.88rem !important;
-        font-weight: 500 !important;
-    }
-
-    div[data-baseweb="input"] input {
-        color: #111111 !important;
-        -webkit-text-fill-color: #111111 !important;
-        caret-color: #111111 !important;
-        background-color: #ffffff !important;
-        border-radius: 4px !important;
-        border: 1px solid #d1d5db !important;
-        padding: 0.35rem 0.5rem !important;
-        font-size: 0.9rem !important;
-    }
-
-    div[data-baseweb="input"]:focus-within {
-        border-color: #111111 !important;
-        box-shadow: none !important;
-    }
-
-    /* hide +/- steppers so boxes look like plain numeric fields */
-    div[data-testid="stNumberInput"] button {
-        display: none !important;
-    }
+# Emitted on every run on purpose: Streamlit removes any element a run does not
+# re-emit, so a once-per-session guard would drop the styles after the first rerun.
+st.html(_page_css())
 
-    .section-title {
-        font-size: 0.9rem;
-        text-transform: uppercase;
-        letter-spacing: 0.12em;
-        color: #4b5563;
-        margin-bottom: 0.75rem;
-    }
+# ---------------------------
+#  Calculation Function
+# ---------------------------
 
-    .metric-label {
-        font-size: 0.8rem;
-        text-transform: uppercase;
-        letter-spacing: 0.12em;
-        color: #6b7280;
-        margin-bottom: 0.35rem;
-    }
+# The arithmetic lives in bridge_financing.py, which is imported once per process instead
+# of being re-executed with this script on every rerun; only the memoisation is Streamlit's.
+calculate_bridge_financing = st.cache_data(max_entries=128, show_spinner=False)(_calculate_bridge_financing)
+
+# Static row and series labels for the margin and sensitivity charts.
+_MARGIN_CATEGORIES = ("Gross margin", "Financing cost", "Net margin")
+_MARGIN_TYPES = ("Initial", "Cost", "Final")
+_SENSITIVITY_SERIES = ("Net margin", "Financing cost")
+
+# Vega-Lite specs for the three charts, written out directly rather than built with Altair:
+# each run only shallow-copies one with its rows under "datasets", and nothing touches
+# Altair's process-global theme or data-transformer state.
+_CHART_CONFIG = {
+    "view": {"strokeWidth": 0},
+    "axis": {"labelColor": "#111111", "titleColor": "#111111", "gridColor": "#e5e7eb"},
+}
+
+_MARGIN_CHART_SPEC = {
+    "data": {"name": "margin"},
+    "mark": {"type": "bar", "size": 40},
+    "encoding": {
+        "x": {
+            "field": "Category",
+            "type": "nominal",
+            "sort": list(_MARGIN_CATEGORIES),
+            "axis": {"labelAngle": 0, "title": None, "grid": False},
+        },
+        "y": {
+            "field": "Amount",
+            "type": "quantitative",
+            "axis": {"format": ",", "title": f"Amount ({CURRENCY_SYMBOL})", "grid": True},
+        },
+        "color": {
+            "field": "Type",
+            "type": "nominal",
+            "scale": {"domain": list(_MARGIN_TYPES), "range": ["#9ca3af", "#ef4444", "#10b981"]},
+            "legend": None,
+        },
+        "tooltip": [
+            {"field": "Category", "type": "nominal"},
+            {"field": "Amount", "type": "quantitative", "format": ",.2f", "title": f"Amount ({CURRENCY_SYMBOL})"},
+        ],
+    },
+    "height": 280,
+    "background": "transparent",
+    "config": _CHART_CONFIG,
+}
+
+_SENSITIVITY_CHART_SPEC = {
+    "data": {"name": "sweep"},
+    "transform": [{"fold": list(_SENSITIVITY_SERIES), "as": ["Series", "Amount"]}],
+    "mark": {"type": "line"},
+    "encoding": {
+        "x": {
+            "field": "Days",
+            "type": "quantitative",
+            "axis": {"grid": False, "tickMinStep": 1, "title": "Days outstanding"},
+        },
+        "y": {
+            "field": "Amount",
+            "type": "quantitative",
+            "axis": {"format": ",", "title": f"Amount ({CURRENCY_SYMBOL})", "grid": True},
+        },
+        "color": {
+            "field": "Series",
+            "type": "nominal",
+            "scale": {"domain": list(_SENSITIVITY_SERIES), "range": ["#10b981", "#ef4444"]},
+            "legend": {"orient": "bottom", "title": None},
+        },
+        "tooltip": [
+            {"field": "Days", "type": "quantitative", "title": "Days outstanding"},
+            {"field": "Series", "type": "nominal"},
+            {"field": "Amount", "type": "quantitative", "format": ",.2f", "title": f"Amount ({CURRENCY_SYMBOL})"},
+        ],
+    },
+    "height": 280,
+    "background": "transparent",
+    "config": _CHART_CONFIG,
+}
+
+_COST_HEATMAP_SPEC = {
+    "data": {"name": "cost_grid"},
+    "mark": {"type": "rect"},
+    "encoding": {
+        "x": {
+            "field": "Rate",
+            "type": "ordinal",
+            "axis": {"labelAngle": 0, "title": "Annual interest rate (%)"},
+        },
+        "y": {"field": "Days", "type": "ordinal", "axis": {"title": "Days outstanding"}},
+        "color": {
+            "field": "Cost",
+            "type": "quantitative",
+            "scale": {"scheme": "reds"},
+            "legend": {"format": ",", "title": f"Cost ({CURRENCY_SYMBOL})"},
+        },
+        "tooltip": [
+            {"field": "Rate", "type": "ordinal", "title": "Annual interest rate (%)"},
+            {"field": "Days", "type": "ordinal", "title": "Days outstanding"},
+            {"field": "Cost", "type": "quantitative", "format": ",.2f", "title": f"Financing cost ({CURRENCY_SYMBOL})"},
+        ],
+    },
+    "height": 320,
+    "background": "transparent",
+    "config": _CHART_CONFIG,
+}
+
+
+def _margin_chart_data(gross_margin: float, net_margin: float, margin_eaten: float) -> list[dict]:
+    """Vega records for the margin before/after financing bars."""
+
+    amounts = (gross_margin, margin_eaten, net_margin)
+    return [
+        {"Category": category, "Amount": amount, "Type": kind}
+        for category, amount, kind in zip(_MARGIN_CATEGORIES, amounts, _MARGIN_TYPES)
+    ]
+
+
+def _sensitivity_data(days: np.ndarray, net_margin: np.ndarray, financing_cost: np.ndarray) -> list[dict]:
+    """Vega records for the days-outstanding sweep, one per swept term."""
+
+    return [
+        {"Days": day, "Net margin": net, "Financing cost": cost}
+        for day, net, cost in zip(days.tolist(), net_margin.tolist(), financing_cost.tolist())
+    ]
+
+
+def _cost_grid_data(grid: np.ndarray) -> list[dict]:
+    """Vega records for the heatmap, one per (days, rate) cell of ``grid``."""
+
+    return [
+        {"Rate": rate, "Days": days, "Cost": cost}
+        for days, row in zip(HEATMAP_DAYS.tolist(), grid.tolist())
+        for rate, cost in zip(HEATMAP_RATES_PCT.tolist(), row)
+    ]
+
+
+# Summary KPI grid, filled from BridgeResult._asdict() on each run.
+_SUMMARY_TEMPLATE = (
+    '<div class="metrics-grid">'
+    "<div>"
+    '<div class="metric-label">Net margin (after financing)</div>'
+    f'<div class="metric-value positive">{CURRENCY_SYMBOL} {{net_margin_after_financing:,.0f}}</div>'
+    f'<div class="metric-sub">Gross margin: {CURRENCY_SYMBOL} {{gross_margin_value:,.0f}}</div>'
+    "</div>"
+    "<div>"
+    '<div class="metric-label">Cost of financing</div>'
+    f'<div class="metric-value negative">{CURRENCY_SYMBOL} {{margin_eaten_value:,.0f}}</div>'
+    f'<div class="metric-sub">Interest: {CURRENCY_SYMBOL} {{interest_cost:,.0f}} '
+    f"| Fees: {CURRENCY_SYMBOL} {{total_fees:,.0f}}</div>"
+    "</div>"
+    "<div>"
+    '<div class="metric-label">Margin erosion</div>'
+    '<div class="metric-value negative">{margin_eaten_pct_of_margin:.1f}%</div>'
+    '<div class="metric-sub">Percentage of gross margin lost to financing</div>'
+    "</div>"
+    "<div>"
+    '<div class="metric-label">Effective annualized cost</div>'
+    '<div class="metric-value neutral">{effective_annualized_cost_pct:.2f}%</div>'
+    '<div class="metric-sub">Based on {days_outstanding} days outstanding</div>'
+    "</div>"
+    "</div>"
+)
 
-    .metric-value {
-        font-size: 1.6rem;
-        font-weight: 600;
-        margin-bottom: 0.1rem;
-    }
 
-    .metric-value.positive { color: #16a34a; }   /* green */
-    .metric-value.negative { color: #dc2626; }   /* red */
-    .metric-value.neutral  { color: #2563eb; }   /* blue */
+def _summary_html(result: BridgeResult) -> str:
+    """HTML for the summary KPI grid."""
 
-    .metric-sub {
-        font-size: 0.9rem;
-        color: #4b5563;
-    }
+    return _SUMMARY_TEMPLATE.format_map(result._asdict())
 
-    /* custom table for breakdown */
-    table.bf-table {
-        width: 100%;
-        border-collapse: collapse;
-        font-size: 0.9rem;
-        margin-top: 0.4rem;
-    }
-    .bf-table th {
-        text-align: left;
-        padding: 6px 4px;
-        border-bottom: 1px solid #e5e7eb;
-        color: #374151;
-        font-weight: 600;
-    }
-    .bf-table td {
-        padding: 6px 4px;
-        border-bottom: 1px solid #f3f4f6;
-        color: #111111;
-    }
-    .bf-table tr:last-child td {
-        border-bottom: none;
-    }
 
-    footer {visibility: hidden;}
-    </style>
-    """,
-    unsafe_allow_html=True,
+# Detailed breakdown table, filled the same way as the summary grid.
+_BREAKDOWN_TEMPLATE = (
+    '<table class="bf-table">'
+    "<thead><tr><th>Metric</th><th>Value</th></tr></thead>"
+    "<tbody>"
+    f"<tr><td>Principal borrowed</td><td>{CURRENCY_SYMBOL} {{principal_borrowed:,.2f}}</td></tr>"
+    f"<tr><td>Interest cost</td><td>{CURRENCY_SYMBOL} {{interest_cost:,.2f}}</td></tr>"
+    f"<tr><td>Arrangement + fixed fees</td><td>{CURRENCY_SYMBOL} {{total_fees:,.2f}}</td></tr>"
+    f"<tr><td>Total financing cost</td><td>{CURRENCY_SYMBOL} {{total_financing_cost:,.2f}}</td></tr>"
+    "<tr><td>Financing cost (% of invoice)</td><td>{financing_cost_pct_of_invoice:.2f}%</td></tr>"
+    "</tbody>"
+    "</table>"
 )
 
-# ---------------------------
-#  Calculation Function
-# ---------------------------
 
-def calculate_bridge_financing(
-    annual_interest_rate_pct: float,
-    invoice_amount: float,
-    days_outstanding: int,
-    margin_pct: float,
-    advance_rate_pct: float = 80.0,
-    arrangement_fee_pct: float = 0.0,
-    fixed_fee: float = 0.0,
-) -> dict:
-    """Calculate the economics of bridge financing against an invoice."""
-
-    annual_rate = annual_interest_rate_pct / 100.0
-    margin_rate = margin_pct / 100.0
-    advance_rate = advance_rate_pct / 100.0
-    arrangement_fee_rate = arrangement_fee_pct / 100.0
-
-    principal_borrowed = invoice_amount * advance_rate
-    gross_margin_value = invoice_amount * margin_rate
-
-    if days_outstanding <= 0:
-        interest_cost = 0.0
-    else:
-        interest_cost = principal_borrowed * annual_rate * (days_outstanding / 365.0)
-
-    arrangement_fee_value = invoice_amount * arrangement_fee_rate
-    total_fees = arrangement_fee_value + fixed_fee
-
-    total_financing_cost = interest_cost + total_fees
-    net_margin_after_financing = gross_margin_value - total_financing_cost
-
-    margin_eaten_value = total_financing_cost
-    margin_eaten_pct_of_margin = (
-        (margin_eaten_value / gross_margin_value) * 100.0 if gross_margin_value > 0 else 0.0
-    )
+def _breakdown_html(result: BridgeResult) -> str:
+    """HTML for the detailed breakdown table."""
 
-    financing_cost_pct_of_invoice = (total_financing_cost / invoice_amount) * 100.0
-
-    if days_outstanding > 0:
-        effective_annualized_cost_pct = financing_cost_pct_of_invoice * (365.0 / days_outstanding)
-    else:
-        effective_annualized_cost_pct = 0.0
-
-    return {
-        "invoice_amount": invoice_amount,
-        "annual_interest_rate_pct": annual_interest_rate_pct,
-        "days_outstanding": days_outstanding,
-        "margin_pct": margin_pct,
-        "advance_rate_pct": advance_rate_pct,
-        "arrangement_fee_pct": arrangement_fee_pct,
-        "fixed_fee": fixed_fee,
-        "principal_borrowed": principal_borrowed,
-        "gross_margin_value": gross_margin_value,
-        "interest_cost": interest_cost,
-        "total_fees": total_fees,
-        "total_financing_cost": total_financing_cost,
-        "net_margin_after_financing": net_margin_after_financing,
-        "margin_eaten_value": margin_eaten_value,
-        "margin_eaten_pct_of_margin": margin_eaten_pct_of_margin,
-        "financing_cost_pct_of_invoice": financing_cost_pct_of_invoice,
-        "effective_annualized_cost_pct": effective_annualized_cost_pct,
-    }
+    return _BREAKDOWN_TEMPLATE.format_map(result._asdict())
 
 
 # ===========================
@@ -211,139 +245,133 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# ---------- Inputs ----------
-with st.container(border=True):
-    st.markdown('<div class="section-title">Deal parameters</div>', unsafe_allow_html=True)
 
-    c1, c2, c3 = st.columns(3)
+class _RenderedResults(NamedTuple):
+    """Payloads emitted by the results panels, keyed by the deal inputs they were built from."""
 
-    with c1:
-        invoice_amount = st.number_input(
-            f"Invoice amount ({CURRENCY_SYMBOL})",
-            min_value=0.0,
-            value=10000.0,
-            step=1000.0,
-            format="%.2f",
-        )
-        days_outstanding = st.number_input(
-            "Days outstanding",
-            min_value=1,
-            value=60,
-            step=1,
-        )
+    key: tuple
+    summary_html: str
+    margin_chart: dict
+    breakdown_html: str
+    sensitivity_chart: dict
+    cost_heatmap: dict
 
-    with c2:
-        margin_pct = st.number_input(
-            "Gross margin (%)",
-            min_value=0.0,
-            value=25.0,
-            step=0.5,
-            format="%.2f",
-        )
-        advance_rate_pct = st.number_input(
-            "Advance rate (%)",
-            min_value=0.0,
-            max_value=100.0,
-            value=80.0,
-            step=1.0,
-            format="%.2f",
-        )
 
-    with c3:
-        annual_interest_rate_pct = st.number_input(
-            "Annual interest rate (%)",
-            min_value=0.0,
-            value=18.0,
-            step=0.25,
-            format="%.2f",
-        )
-        arrangement_fee_pct = st.number_input(
-            "Arrangement fee (%)",
-            min_value=0.0,
-            value=1.0,
-            step=0.1,
-            format="%.2f",
-        )
+def _build_rendered_results(
+    annual_interest_rate_pct: float,
+    invoice_amount: float,
+    days_outstanding: int,
+    margin_pct: float,
+    advance_rate_pct: float,
+    arrangement_fee_pct: float,
+    fixed_fee: float,
+) -> _RenderedResults:
+    """Compute one scenario plus its sensitivity sweep and build every rendered payload."""
 
-    fixed_fee = st.number_input(
-        f"Fixed fees ({CURRENCY_SYMBOL})",
-        min_value=0.0,
-        value=0.0,
-        step=100.0,
-        format="%.2f",
+    result = calculate_bridge_financing(
+        annual_interest_rate_pct=annual_interest_rate_pct,
+        invoice_amount=invoice_amount,
+        days_outstanding=days_outstanding,
+        margin_pct=margin_pct,
+        advance_rate_pct=advance_rate_pct,
+        arrangement_fee_pct=arrangement_fee_pct,
+        fixed_fee=fixed_fee,
     )
 
-st.markdown("")
+    margin_chart = {
+        **_MARGIN_CHART_SPEC,
+        "datasets": {
+            "margin": _margin_chart_data(
+                result.gross_margin_value, result.net_margin_after_financing, result.margin_eaten_value
+            )
+        },
+    }
 
-# ---------- Outputs ----------
-if invoice_amount <= 0:
-    st.info(f"Enter a positive invoice amount ({CURRENCY_SYMBOL}) to generate calculations.")
-else:
-    result = calculate_bridge_financing(
+    # Fixed number of points however long the term: SENSITIVITY_MAX_DAYS evenly spaced
+    # whole days from 1 to max(SENSITIVITY_MAX_DAYS, days_outstanding) (daily for short terms).
+    sweep_days = np.unique(
+        np.linspace(1, max(SENSITIVITY_MAX_DAYS, days_outstanding), SENSITIVITY_MAX_DAYS).round()
+    )
+    sweep = calculate_bridge_financing_vec(
         annual_interest_rate_pct=annual_interest_rate_pct,
         invoice_amount=invoice_amount,
-        days_outstanding=int(days_outstanding),
+        days_outstanding=sweep_days,
         margin_pct=margin_pct,
         advance_rate_pct=advance_rate_pct,
         arrangement_fee_pct=arrangement_fee_pct,
         fixed_fee=fixed_fee,
     )
+    sensitivity_chart = {
+        **_SENSITIVITY_CHART_SPEC,
+        "datasets": {
+            "sweep": _sensitivity_data(
+                sweep_days, sweep.net_margin_after_financing, sweep.total_financing_cost
+            )
+        },
+    }
 
-    gross_margin = result["gross_margin_value"]
-    net_margin = result["net_margin_after_financing"]
-    margin_eaten_val = result["margin_eaten_value"]
-    margin_eaten_pct = result["margin_eaten_pct_of_margin"]
+    cost_grid = financing_cost_grid(
+        annual_interest_rates_pct=HEATMAP_RATES_PCT,
+        days_outstanding=HEATMAP_DAYS,
+        invoice_amount=invoice_amount,
+        advance_rate_pct=advance_rate_pct,
+        arrangement_fee_pct=arrangement_fee_pct,
+        fixed_fee=fixed_fee,
+    )
+    cost_heatmap = {**_COST_HEATMAP_SPEC, "datasets": {"cost_grid": _cost_grid_data(cost_grid)}}
+
+    return _RenderedResults(
+        key=(
+            annual_interest_rate_pct,
+            invoice_amount,
+            days_outstanding,
+            margin_pct,
+            advance_rate_pct,
+            arrangement_fee_pct,
+            fixed_fee,
+        ),
+        summary_html=_summary_html(result),
+        margin_chart=margin_chart,
+        breakdown_html=_breakdown_html(result),
+        sensitivity_chart=sensitivity_chart,
+        cost_heatmap=cost_heatmap,
+    )
+
+
+def _render_results(
+    annual_interest_rate_pct: float,
+    invoice_amount: float,
+    days_outstanding: int,
+    margin_pct: float,
+    advance_rate_pct: float,
+    arrangement_fee_pct: float,
+    fixed_fee: float,
+) -> None:
+    """Summary, chart, breakdown and sensitivity panels for one set of deal inputs."""
+
+    if invoice_amount <= 0:
+        st.info(f"Enter a positive invoice amount ({CURRENCY_SYMBOL}) to generate calculations.")
+        return
+
+    key = (
+        annual_interest_rate_pct,
+        invoice_amount,
+        days_outstanding,
+        margin_pct,
+        advance_rate_pct,
+        arrangement_fee_pct,
+        fixed_fee,
+    )
+    # Reruns with unchanged inputs (focus/blur, fragment reruns) re-emit the stored payloads.
+    rendered = st.session_state.get("_rendered_results")
+    if rendered is None or rendered.key != key:
+        rendered = _build_rendered_results(*key)
+        st.session_state["_rendered_results"] = rendered
 
     # --- Summary box ---
     with st.container(border=True):
         st.markdown('<div class="section-title">Summary</div>', unsafe_allow_html=True)
-
-        k1, k2, k3, k4 = st.columns(4)
-
-        with k1:
-            st.markdown('<div class="metric-label">Net margin (after financing)</div>', unsafe_allow_html=True)
-            st.markdown(
-                f'<div class="metric-value positive">{CURRENCY_SYMBOL} {net_margin:,.0f}</div>',
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f'<div class="metric-sub">Gross margin: {CURRENCY_SYMBOL} {gross_margin:,.0f}</div>',
-                unsafe_allow_html=True,
-            )
-
-        with k2:
-            st.markdown('<div class="metric-label">Cost of financing</div>', unsafe_allow_html=True)
-            st.markdown(
-                f'<div class="metric-value negative">{CURRENCY_SYMBOL} {margin_eaten_val:,.0f}</div>',
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f'<div class="metric-sub">Interest: {CURRENCY_SYMBOL} {result["interest_cost"]:,.0f} '
-                f'| Fees: {CURRENCY_SYMBOL} {result["total_fees"]:,.0f}</div>',
-                unsafe_allow_html=True,
-            )
-
-        with k3:
-            st.markdown('<div class="metric-label">Margin erosion</div>', unsafe_allow_html=True)
-            st.markdown(
-                f'<div class="metric-value negative">{margin_eaten_pct:.1f}%</div>',
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                '<div class="metric-sub">Percentage of gross margin lost to financing</div>',
-                unsafe_allow_html=True,
-            )
-
-        with k4:
-            st.markdown('<div class="metric-label">Effective annualized cost</div>', unsafe_allow_html=True)
-            st.markdown(
-                f'<div class="metric-value neutral">{result["effective_annualized_cost_pct"]:.2f}%</div>',
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f'<div class="metric-sub">Based on {int(days_outstanding)} days outstanding</div>',
-                unsafe_allow_html=True,
-            )
+        st.markdown(rendered.summary_html, unsafe_allow_html=True)
 
     st.markdown("")
 
@@ -353,74 +381,109 @@ else:
     with col_chart:
         with st.container(border=True):
             st.markdown('<div class="section-title">Margin before and after financing</div>', unsafe_allow_html=True)
+            st.vega_lite_chart(rendered.margin_chart, width="stretch")
 
-            chart_data = pd.DataFrame(
-                [
-                    {"Category": "Gross margin", "Amount": gross_margin, "Type": "Initial"},
-                    {"Category": "Financing cost", "Amount": margin_eaten_val, "Type": "Cost"},
-                    {"Category": "Net margin", "Amount": net_margin, "Type": "Final"},
-                ]
+    with col_table:
+        with st.container(border=True):
+            st.markdown('<div class="section-title">Detailed breakdown</div>', unsafe_allow_html=True)
+            st.markdown(rendered.breakdown_html, unsafe_allow_html=True)
+
+    st.markdown("")
+
+    # --- Sensitivity ---
+    with st.container(border=True):
+        st.markdown('<div class="section-title">Sensitivity to days outstanding</div>', unsafe_allow_html=True)
+        st.vega_lite_chart(rendered.sensitivity_chart, width="stretch")
+
+    st.markdown("")
+
+    with st.container(border=True):
+        st.markdown('<div class="section-title">Financing cost by rate and days outstanding</div>', unsafe_allow_html=True)
+        st.vega_lite_chart(rendered.cost_heatmap, width="stretch")
+
+
+@st.fragment
+def _calculator() -> None:
+    """Deal inputs and results; submitting the inputs form reruns only this fragment."""
+
+    # ---------- Inputs ----------
+    with st.form("inputs"):
+        st.markdown('<div class="section-title">Deal parameters</div>', unsafe_allow_html=True)
+
+        c1, c2, c3 = st.columns(3)
+
+        with c1:
+            invoice_amount = st.number_input(
+                f"Invoice amount ({CURRENCY_SYMBOL})",
+                min_value=0.0,
+                value=10000.0,
+                step=1000.0,
+                format="%.2f",
+            )
+            days_outstanding = st.number_input(
+                "Days outstanding",
+                min_value=1,
+                value=60,
+                step=1,
             )
 
-            chart = (
-                alt.Chart(chart_data)
-                .mark_bar(size=40)
-                .encode(
-                    x=alt.X(
-                        "Category",
-                        sort=["Gross margin", "Financing cost", "Net margin"],
-                        axis=alt.Axis(labelAngle=0, title=None, grid=False),
-                    ),
-                    y=alt.Y(
-                        "Amount",
-                        axis=alt.Axis(format=",", title=f"Amount ({CURRENCY_SYMBOL})", grid=True),
-                    ),
-                    color=alt.Color(
-                        "Type",
-                        scale=alt.Scale(
-                            domain=["Initial", "Cost", "Final"],
-                            range=["#9ca3af", "#ef4444", "#10b981"],
-                        ),
-                        legend=None,
-                    ),
-                    tooltip=[
-                        "Category",
-                        alt.Tooltip("Amount", format=",.2f", title=f"Amount ({CURRENCY_SYMBOL})"),
-                    ],
-                )
-                .properties(height=280, background="transparent")
-                .configure_view(strokeWidth=0)
-                .configure_axis(
-                    labelColor="#111111",
-                    titleColor="#111111",
-                    gridColor="#e5e7eb",
-                )
+        with c2:
+            margin_pct = st.number_input(
+                "Gross margin (%)",
+                min_value=0.0,
+                value=25.0,
+                step=0.5,
+                format="%.2f",
+            )
+            advance_rate_pct = st.number_input(
+                "Advance rate (%)",
+                min_value=0.0,
+                max_value=100.0,
+                value=80.0,
+                step=1.0,
+                format="%.2f",
             )
 
-            st.altair_chart(chart, use_container_width=True)
+        with c3:
+            annual_interest_rate_pct = st.number_input(
+                "Annual interest rate (%)",
+                min_value=0.0,
+                value=18.0,
+                step=0.25,
+                format="%.2f",
+            )
+            arrangement_fee_pct = st.number_input(
+                "Arrangement fee (%)",
+                min_value=0.0,
+                value=1.0,
+                step=0.1,
+                format="%.2f",
+            )
 
-    with col_table:
-        with st.container(border=True):
-            st.markdown('<div class="section-title">Detailed breakdown</div>', unsafe_allow_html=True)
+        fixed_fee = st.number_input(
+            f"Fixed fees ({CURRENCY_SYMBOL})",
+            min_value=0.0,
+            value=0.0,
+            step=100.0,
+            format="%.2f",
+        )
+
+        st.form_submit_button("Recalculate")
+
+    st.markdown("")
+
+    # ---------- Outputs ----------
+    # Stepping a number_input can leave float noise (10000.000000001); quantising to the
+    # inputs' precision keeps identical-looking scenarios on the same cache keys.
+    _render_results(
+        annual_interest_rate_pct=round(annual_interest_rate_pct, 4),
+        invoice_amount=round(invoice_amount, 2),
+        days_outstanding=int(days_outstanding),
+        margin_pct=round(margin_pct, 4),
+        advance_rate_pct=round(advance_rate_pct, 4),
+        arrangement_fee_pct=round(arrangement_fee_pct, 4),
+        fixed_fee=round(fixed_fee, 2),
+    )
 
-            breakdown_df = pd.DataFrame(
-                {
-                    "Metric": [
-                        "Principal borrowed",
-                        "Interest cost",
-                        "Arrangement + fixed fees",
-                        "Total financing cost",
-                        "Financing cost (% of invoice)",
-                    ],
-                    "Value": [
-                        f"{CURRENCY_SYMBOL} {result['principal_borrowed']:,.2f}",
-                        f"{CURRENCY_SYMBOL} {result['interest_cost']:,.2f}",
-                        f"{CURRENCY_SYMBOL} {result['total_fees']:,.2f}",
-                        f"{CURRENCY_SYMBOL} {result['total_financing_cost']:,.2f}",
-                        f"{result['financing_cost_pct_of_invoice']:.2f}%",
-                    ],
-                }
-            )
 
-            html_table = breakdown_df.to_html(index=False, classes="bf-table", border=0)
-            st.markdown(html_table, unsafe_allow_html=True)
+_calculator()
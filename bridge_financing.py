@@ -0,0 +1,428 @@
+"""Bridge financing arithmetic: the scalar calculation, its vectorised sweep variant and the
+rate x days financing-cost grid."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from numba import njit, vectorize
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+    def vectorize(*args, **kwargs):
+        return np.vectorize
+
+# Reciprocals of the percent and day-count bases, so the hot path multiplies instead of divides.
+_INV_100 = 0.01
+_INV_365 = 1.0 / 365.0
+# Floor for guarded denominators; the guarded lanes are zeroed by their predicate anyway
+_EPS = 1e-12
+
+
+class BridgeResult(NamedTuple):
+    """Inputs and derived economics of a single bridge financing scenario."""
+
+    invoice_amount: float
+    annual_interest_rate_pct: float
+    days_outstanding: int
+    margin_pct: float
+    advance_rate_pct: float
+    arrangement_fee_pct: float
+    fixed_fee: float
+    principal_borrowed: float
+    gross_margin_value: float
+    interest_cost: float
+    total_fees: float
+    total_financing_cost: float
+    net_margin_after_financing: float
+    margin_eaten_value: float
+    margin_eaten_pct_of_margin: float
+    financing_cost_pct_of_invoice: float
+    effective_annualized_cost_pct: float
+
+
+@dataclass(frozen=True, slots=True)
+class BridgeResultArrays:
+    """BridgeResult laid out as parallel arrays, one element per scenario in a sweep."""
+
+    invoice_amount: np.ndarray
+    annual_interest_rate_pct: np.ndarray
+    days_outstanding: np.ndarray
+    margin_pct: np.ndarray
+    advance_rate_pct: np.ndarray
+    arrangement_fee_pct: np.ndarray
+    fixed_fee: np.ndarray
+    principal_borrowed: np.ndarray
+    gross_margin_value: np.ndarray
+    interest_cost: np.ndarray
+    total_fees: np.ndarray
+    total_financing_cost: np.ndarray
+    net_margin_after_financing: np.ndarray
+    margin_eaten_value: np.ndarray
+    margin_eaten_pct_of_margin: np.ndarray
+    financing_cost_pct_of_invoice: np.ndarray
+    effective_annualized_cost_pct: np.ndarray
+
+
+# Explicit signatures, here and on the kernels below, compile at import (or load from the
+# on-disk cache) rather than on the first call.
+@njit(
+    "UniTuple(float64, 10)(float64, float64, int64, float64, float64, float64, float64)",
+    cache=True,
+    fastmath=True,
+)
+def _calc_core(
+    annual_interest_rate_pct,
+    invoice_amount,
+    days_outstanding,
+    margin_pct,
+    advance_rate_pct,
+    arrangement_fee_pct,
+    fixed_fee,
+):
+    """Arithmetic core of calculate_bridge_financing, returning the derived scalars as a tuple."""
+
+    annual_rate = annual_interest_rate_pct * _INV_100
+    margin_rate = margin_pct * _INV_100
+    advance_rate = advance_rate_pct * _INV_100
+    arrangement_fee_rate = arrangement_fee_pct * _INV_100
+
+    principal_borrowed = invoice_amount * advance_rate
+    gross_margin_value = invoice_amount * margin_rate
+
+    # Year fraction, shared by the interest accrual and the annualised rate below; clamping
+    # at zero makes non-positive terms accrue no interest without a branch.
+    year_fraction = max(days_outstanding, 0) * _INV_365
+    interest_cost = principal_borrowed * annual_rate * year_fraction
+
+    arrangement_fee_value = invoice_amount * arrangement_fee_rate
+    total_fees = arrangement_fee_value + fixed_fee
+
+    total_financing_cost = interest_cost + total_fees
+    net_margin_after_financing = gross_margin_value - total_financing_cost
+
+    margin_eaten_value = total_financing_cost
+    # Branchless guards (max + predicate) so the compiled code lowers to selects, not jumps
+    margin_eaten_pct_of_margin = (
+        margin_eaten_value / max(gross_margin_value, _EPS) * 100.0 * (gross_margin_value > 0)
+    )
+
+    # Any non-zero invoice (negative ones included) has a percentage; a zero invoice gives 0
+    financing_cost_pct_of_invoice = (
+        total_financing_cost / (invoice_amount + (invoice_amount == 0)) * 100.0 * (invoice_amount != 0)
+    )
+
+    effective_annualized_cost_pct = (
+        financing_cost_pct_of_invoice / max(year_fraction, _EPS) * (days_outstanding > 0)
+    )
+
+    return (
+        principal_borrowed,
+        gross_margin_value,
+        interest_cost,
+        total_fees,
+        total_financing_cost,
+        net_margin_after_financing,
+        margin_eaten_value,
+        margin_eaten_pct_of_margin,
+        financing_cost_pct_of_invoice,
+        effective_annualized_cost_pct,
+    )
+
+
+def calculate_bridge_financing(
+    annual_interest_rate_pct: float,
+    invoice_amount: float,
+    days_outstanding: int,
+    margin_pct: float,
+    advance_rate_pct: float = 80.0,
+    arrangement_fee_pct: float = 0.0,
+    fixed_fee: float = 0.0,
+) -> BridgeResult:
+    """Calculate the economics of bridge financing against an invoice."""
+
+    (
+        principal_borrowed,
+        gross_margin_value,
+        interest_cost,
+        total_fees,
+        total_financing_cost,
+        net_margin_after_financing,
+        margin_eaten_value,
+        margin_eaten_pct_of_margin,
+        financing_cost_pct_of_invoice,
+        effective_annualized_cost_pct,
+    ) = _calc_core(
+        float(annual_interest_rate_pct),
+        float(invoice_amount),
+        int(days_outstanding),
+        float(margin_pct),
+        float(advance_rate_pct),
+        float(arrangement_fee_pct),
+        float(fixed_fee),
+    )
+
+    return BridgeResult(
+        invoice_amount=invoice_amount,
+        annual_interest_rate_pct=annual_interest_rate_pct,
+        days_outstanding=days_outstanding,
+        margin_pct=margin_pct,
+        advance_rate_pct=advance_rate_pct,
+        arrangement_fee_pct=arrangement_fee_pct,
+        fixed_fee=fixed_fee,
+        principal_borrowed=principal_borrowed,
+        gross_margin_value=gross_margin_value,
+        interest_cost=interest_cost,
+        total_fees=total_fees,
+        total_financing_cost=total_financing_cost,
+        net_margin_after_financing=net_margin_after_financing,
+        margin_eaten_value=margin_eaten_value,
+        margin_eaten_pct_of_margin=margin_eaten_pct_of_margin,
+        financing_cost_pct_of_invoice=financing_cost_pct_of_invoice,
+        effective_annualized_cost_pct=effective_annualized_cost_pct,
+    )
+
+
+@njit(
+    "void(float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1],"
+    " float64[::1], float64[:, ::1])",
+    cache=True,
+    fastmath=True,
+    boundscheck=False,
+)
+def _core_kernel(
+    annual_interest_rate_pct,
+    invoice_amount,
+    days_outstanding,
+    margin_pct,
+    advance_rate_pct,
+    arrangement_fee_pct,
+    fixed_fee,
+    out,
+):
+    """Fused loop over flattened sweep inputs, writing the ten derived fields as rows of ``out``."""
+
+    for i in range(invoice_amount.shape[0]):
+        invoice = invoice_amount[i]
+        days = days_outstanding[i]
+        year_fraction = max(days, 0.0) * _INV_365
+
+        principal_borrowed = invoice * advance_rate_pct[i] * _INV_100
+        gross_margin_value = invoice * margin_pct[i] * _INV_100
+        interest_cost = principal_borrowed * annual_interest_rate_pct[i] * _INV_100 * year_fraction
+        total_fees = invoice * arrangement_fee_pct[i] * _INV_100 + fixed_fee[i]
+        total_financing_cost = interest_cost + total_fees
+
+        out[0, i] = principal_borrowed
+        out[1, i] = gross_margin_value
+        out[2, i] = interest_cost
+        out[3, i] = total_fees
+        out[4, i] = total_financing_cost
+        out[5, i] = gross_margin_value - total_financing_cost
+        out[6, i] = total_financing_cost
+        out[7, i] = total_financing_cost / max(gross_margin_value, _EPS) * 100.0 * (gross_margin_value > 0)
+        cost_pct_of_invoice = total_financing_cost / (invoice + (invoice == 0)) * 100.0 * (invoice != 0)
+        out[8, i] = cost_pct_of_invoice
+        out[9, i] = cost_pct_of_invoice / max(year_fraction, _EPS) * (days > 0)
+
+
+def _core_numpy(
+    annual_interest_rate_pct,
+    invoice_amount,
+    days_outstanding,
+    margin_pct,
+    advance_rate_pct,
+    arrangement_fee_pct,
+    fixed_fee,
+):
+    """NumPy fallback for _core_kernel on equally shaped arrays, returning the derived fields."""
+
+    principal_borrowed = invoice_amount * advance_rate_pct * _INV_100
+    gross_margin_value = invoice_amount * margin_pct * _INV_100
+
+    interest_cost = np.multiply(principal_borrowed, annual_interest_rate_pct)
+    np.multiply(interest_cost, np.maximum(days_outstanding, 0.0), out=interest_cost)
+    np.multiply(interest_cost, _INV_100 * _INV_365, out=interest_cost)
+
+    total_fees = invoice_amount * arrangement_fee_pct * _INV_100
+    np.add(total_fees, fixed_fee, out=total_fees)
+
+    total_financing_cost = interest_cost + total_fees
+    net_margin_after_financing = gross_margin_value - total_financing_cost
+
+    margin_eaten_value = total_financing_cost
+    margin_eaten_pct_of_margin = np.divide(
+        margin_eaten_value * 100.0,
+        gross_margin_value,
+        out=np.zeros_like(margin_eaten_value),
+        where=gross_margin_value > 0,
+    )
+
+    financing_cost_pct_of_invoice = np.divide(
+        total_financing_cost * 100.0,
+        invoice_amount,
+        out=np.zeros_like(total_financing_cost),
+        where=invoice_amount != 0,
+    )
+
+    effective_annualized_cost_pct = np.divide(
+        total_financing_cost * 36500.0,
+        invoice_amount * days_outstanding,
+        out=np.zeros_like(financing_cost_pct_of_invoice),
+        where=(days_outstanding > 0) & (invoice_amount != 0),
+    )
+
+    return (
+        principal_borrowed,
+        gross_margin_value,
+        interest_cost,
+        total_fees,
+        total_financing_cost,
+        net_margin_after_financing,
+        margin_eaten_value,
+        margin_eaten_pct_of_margin,
+        financing_cost_pct_of_invoice,
+        effective_annualized_cost_pct,
+    )
+
+
+def calculate_bridge_financing_vec(
+    annual_interest_rate_pct,
+    invoice_amount,
+    days_outstanding,
+    margin_pct,
+    advance_rate_pct=80.0,
+    arrangement_fee_pct=0.0,
+    fixed_fee=0.0,
+) -> BridgeResultArrays:
+    """Vectorized calculate_bridge_financing for parameter sweeps.
+
+    Every argument may be a scalar or a NumPy array; inputs are broadcast
+    against each other and each result field is an array of the broadcast shape.
+    """
+
+    inputs = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=np.float64)
+            for x in (
+                annual_interest_rate_pct,
+                invoice_amount,
+                days_outstanding,
+                margin_pct,
+                advance_rate_pct,
+                arrangement_fee_pct,
+                fixed_fee,
+            )
+        )
+    )
+    (
+        annual_interest_rate_pct,
+        invoice_amount,
+        days_outstanding,
+        margin_pct,
+        advance_rate_pct,
+        arrangement_fee_pct,
+        fixed_fee,
+    ) = inputs
+
+    # Both backends work on the same flattened 1-D views; that also keeps the fallback's
+    # in-place ufunc calls valid when every input is a scalar (0-d).
+    flat = [np.ascontiguousarray(x).ravel() for x in inputs]
+    if NUMBA_AVAILABLE:
+        derived = np.empty((10, flat[0].shape[0]))
+        _core_kernel(*flat, derived)
+    else:
+        derived = np.array(_core_numpy(*flat))
+    (
+        principal_borrowed,
+        gross_margin_value,
+        interest_cost,
+        total_fees,
+        total_financing_cost,
+        net_margin_after_financing,
+        margin_eaten_value,
+        margin_eaten_pct_of_margin,
+        financing_cost_pct_of_invoice,
+        effective_annualized_cost_pct,
+    ) = derived.reshape((10,) + invoice_amount.shape)
+
+    return BridgeResultArrays(
+        invoice_amount=invoice_amount,
+        annual_interest_rate_pct=annual_interest_rate_pct,
+        days_outstanding=days_outstanding,
+        margin_pct=margin_pct,
+        advance_rate_pct=advance_rate_pct,
+        arrangement_fee_pct=arrangement_fee_pct,
+        fixed_fee=fixed_fee,
+        principal_borrowed=principal_borrowed,
+        gross_margin_value=gross_margin_value,
+        interest_cost=interest_cost,
+        total_fees=total_fees,
+        total_financing_cost=total_financing_cost,
+        net_margin_after_financing=net_margin_after_financing,
+        margin_eaten_value=margin_eaten_value,
+        margin_eaten_pct_of_margin=margin_eaten_pct_of_margin,
+        financing_cost_pct_of_invoice=financing_cost_pct_of_invoice,
+        effective_annualized_cost_pct=effective_annualized_cost_pct,
+    )
+
+
+# Not target="parallel": Numba's default threading layer is not safe to enter from several
+# caller threads at once, which a multi-threaded host such as a web app server will do.
+@vectorize(["float64(float64, float64, float64, float64, float64, float64)"], cache=True)
+def _financing_cost_ufunc(
+    annual_interest_rate_pct,
+    invoice_amount,
+    days_outstanding,
+    advance_rate_pct,
+    arrangement_fee_pct,
+    fixed_fee,
+):
+    """Total financing cost of one scenario, as an elementwise ufunc over broadcast inputs."""
+
+    interest_cost = (
+        invoice_amount
+        * advance_rate_pct
+        * _INV_100
+        * annual_interest_rate_pct
+        * _INV_100
+        * (max(days_outstanding, 0.0) * _INV_365)
+    )
+    return interest_cost + invoice_amount * arrangement_fee_pct * _INV_100 + fixed_fee
+
+
+def financing_cost_grid(
+    annual_interest_rates_pct,
+    days_outstanding,
+    invoice_amount,
+    advance_rate_pct=80.0,
+    arrangement_fee_pct=0.0,
+    fixed_fee=0.0,
+) -> np.ndarray:
+    """Total financing cost for every (days, rate) pair of two 1-D axes.
+
+    Row ``i``, column ``j`` of the result is the cost at ``days_outstanding[i]`` and
+    ``annual_interest_rates_pct[j]``; the remaining deal terms are scalars.
+    """
+
+    rates = np.asarray(annual_interest_rates_pct, dtype=np.float64)
+    days = np.asarray(days_outstanding, dtype=np.float64)
+    return _financing_cost_ufunc(
+        rates[np.newaxis, :],
+        invoice_amount,
+        days[:, np.newaxis],
+        advance_rate_pct,
+        arrangement_fee_pct,
+        fixed_fee,
+    )
@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+
+from bridge_financing import (
+    _calc_core,
+    _core_kernel,
+    _core_numpy,
+    _financing_cost_ufunc,
+    calculate_bridge_financing,
+    calculate_bridge_financing_vec,
+)
+
+N = 500
+
+
+def _random_inputs(seed=0):
+    """Random deal terms, including zero/negative invoices, zero margins and non-positive terms."""
+
+    rng = np.random.default_rng(seed)
+    annual_interest_rate_pct = rng.uniform(0.0, 40.0, N)
+    invoice_amount = rng.uniform(-1e5, 1e6, N)
+    invoice_amount[::17] = 0.0
+    days_outstanding = rng.integers(-30, 400, N).astype(np.float64)
+    days_outstanding[::13] = 0.0
+    margin_pct = rng.uniform(0.0, 60.0, N)
+    margin_pct[::11] = 0.0
+    advance_rate_pct = rng.uniform(0.0, 100.0, N)
+    arrangement_fee_pct = rng.uniform(0.0, 5.0, N)
+    fixed_fee = rng.uniform(0.0, 1000.0, N)
+    return (
+        annual_interest_rate_pct,
+        invoice_amount,
+        days_outstanding,
+        margin_pct,
+        advance_rate_pct,
+        arrangement_fee_pct,
+        fixed_fee,
+    )
+
+
+class CoreParityTest(unittest.TestCase):
+    """The scalar core, sweep kernel, NumPy fallback and cost ufunc must agree."""
+
+    def setUp(self):
+        self.inputs = _random_inputs()
+        rate, invoice, days, margin, advance, arrangement, fixed = self.inputs
+        self.expected = np.array(
+            [
+                _calc_core(
+                    float(rate[i]),
+                    float(invoice[i]),
+                    int(days[i]),
+                    float(margin[i]),
+                    float(advance[i]),
+                    float(arrangement[i]),
+                    float(fixed[i]),
+                )
+                for i in range(N)
+            ]
+        ).T
+
+    def assert_matches(self, actual, expected):
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+    def test_kernel_matches_scalar_core(self):
+        out = np.empty((10, N))
+        _core_kernel(*(np.ascontiguousarray(x) for x in self.inputs), out)
+        self.assert_matches(out, self.expected)
+
+    def test_numpy_fallback_matches_scalar_core(self):
+        self.assert_matches(np.array(_core_numpy(*self.inputs)), self.expected)
+
+    def test_cost_ufunc_matches_scalar_core(self):
+        rate, invoice, days, _, advance, arrangement, fixed = self.inputs
+        self.assert_matches(_financing_cost_ufunc(rate, invoice, days, advance, arrangement, fixed), self.expected[4])
+
+    def test_vec_matches_scalar_entry_point(self):
+        rate, invoice, days, margin, advance, arrangement, fixed = self.inputs
+        sweep = calculate_bridge_financing_vec(rate, invoice, days, margin, advance, arrangement, fixed)
+        for i in range(0, N, 25):
+            result = calculate_bridge_financing(
+                rate[i], invoice[i], int(days[i]), margin[i], advance[i], arrangement[i], fixed[i]
+            )
+            for field in result._fields:
+                self.assertAlmostEqual(getattr(sweep, field)[i], getattr(result, field), places=6, msg=field)
+
+
+    def test_vec_accepts_scalar_only_inputs(self):
+        sweep = calculate_bridge_financing_vec(18.0, 10000.0, 60, 25.0)
+        result = calculate_bridge_financing(18.0, 10000.0, 60, 25.0)
+        for field in result._fields:
+            value = getattr(sweep, field)
+            self.assertEqual(np.shape(value), (), msg=field)
+            self.assertAlmostEqual(float(value), getattr(result, field), places=9, msg=field)
+
+    def test_vec_preserves_broadcast_shape(self):
+        sweep = calculate_bridge_financing_vec(np.array([[12.0], [18.0]]), 10000.0, np.arange(1, 4), 25.0)
+        self.assertEqual(sweep.effective_annualized_cost_pct.shape, (2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()